@@ -5,12 +5,26 @@ Downloaded K-Lite Video Codec to get the video player to work
 
 
 
+import argparse
+from collections import OrderedDict
+import http.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
 import logging
 import os
+import queue
+import shutil
+import socket
+import sqlite3
 import subprocess
 import sys
-from time import time
+import tempfile
+import threading
+from time import monotonic, sleep, time
+from urllib.parse import quote, unquote, urlsplit
+from uuid import uuid4
 import webbrowser
+import zlib
 
 from PyQt5.QtCore import QThread, QUrl, pyqtSignal, Qt
 from PyQt5.QtGui import QIcon, QPixmap, QIntValidator
@@ -21,6 +35,7 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout
                              QLineEdit, QComboBox, QWidget, QCheckBox, QSlider, 
                              QGroupBox, QLayout, QMessageBox)
 
+import numpy as np
 import qdarktheme
 
 # Start Logging
@@ -59,8 +74,19 @@ def handle_uncaught_exception(exc_type, exc_value, exc_traceback):
 sys.excepthook = handle_uncaught_exception
 
 
+def is_url(video_path):
+    return video_path.lower().startswith(("http://", "https://"))
+
+
+def ffmpeg_input(video_path):
+    # Persistent connections for http inputs so one ffmpeg run reuses a single connection across its seeks
+    if is_url(video_path):
+        return ["-multiple_requests", "1", "-seekable", "1", "-i", video_path]
+    return ["-i", video_path]
+
+
 def get_video_duration(video_path):
-    cmd = ["ffmpeg", "-i", video_path]
+    cmd = ["ffmpeg", *ffmpeg_input(video_path)]
     result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
     for line in result.stderr.split("\n"):
         if "Duration" in line:
@@ -70,6 +96,494 @@ def get_video_duration(video_path):
             return total_seconds
     return None
 
+
+def write_json_atomic(path, data):
+    # Write to a private temp file and rename over the target so readers never see a partial file
+    tmp_path = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+# Quality filter settings. Scores are computed on small grayscale probe frames
+# decoded by ffmpeg, so the cost stays low no matter what the output resolution is.
+QUALITY_PROBE_WIDTH = 160
+QUALITY_PROBE_HEIGHT = 90
+QUALITY_PROBE_FPS = 4
+QUALITY_MIN_BRIGHTNESS = 16.0   # mean luma (0-255), below this the frame is treated as black
+QUALITY_MIN_SHARPNESS = 20.0    # Laplacian variance, below this the frame is treated as blurred
+QUALITY_MIN_DIFFERENCE = 0.25   # mean absolute luma difference to the neighbouring probe frame, below this it is still
+QUALITY_FROZEN_SECONDS = 3.0    # with the frozen check on, a picture still for this long counts as a frozen feed
+QUALITY_MIN_NOVELTY = 1.0       # with dedupe on, mean absolute luma difference to the last kept frame
+
+
+def read_probe_frames(video_path, start, duration):
+    # Decode a window of the video as tiny grayscale frames straight into a numpy array
+    cmd = ["ffmpeg", "-ss", str(start), "-t", str(duration), *ffmpeg_input(video_path),
+           "-vf", f"fps={QUALITY_PROBE_FPS},scale={QUALITY_PROBE_WIDTH}:{QUALITY_PROBE_HEIGHT},format=gray",
+           "-f", "rawvideo", "-pix_fmt", "gray", "-an", "-"]
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=subprocess.CREATE_NO_WINDOW)
+    frame_size = QUALITY_PROBE_WIDTH * QUALITY_PROBE_HEIGHT
+    count = len(result.stdout) // frame_size
+    frames = np.frombuffer(result.stdout[:count * frame_size], dtype=np.uint8)
+    frames = frames.reshape(count, QUALITY_PROBE_HEIGHT, QUALITY_PROBE_WIDTH).astype(np.float32)
+    timestamps = start + np.arange(count) / QUALITY_PROBE_FPS
+    return timestamps, frames
+
+
+def score_probe_frames(frames, reference=None):
+    # Brightness, sharpness and frame-to-frame difference for a whole stack of probe frames at once
+    brightness = frames.mean(axis=(1, 2))
+    laplacian = (frames[:, :-2, 1:-1] + frames[:, 2:, 1:-1] + frames[:, 1:-1, :-2] + frames[:, 1:-1, 2:]
+                 - 4 * frames[:, 1:-1, 1:-1])
+    sharpness = laplacian.var(axis=(1, 2))
+
+    # Each frame is compared with the one before it; the first frame borrows the difference to the second
+    if len(frames) < 2:
+        difference = np.full(len(frames), np.inf, dtype=np.float32)
+        still_seconds = np.zeros(len(frames), dtype=np.float32)
+    else:
+        adjacent = np.abs(np.diff(frames, axis=0)).mean(axis=(1, 2))
+        difference = np.concatenate([adjacent[:1], adjacent])
+
+        # How long the picture stays unchanged around each frame: frames between two changes form one run
+        run_ids = np.concatenate([[0], np.cumsum(adjacent >= QUALITY_MIN_DIFFERENCE)])
+        run_lengths = np.bincount(run_ids)
+        still_seconds = (run_lengths[run_ids] - 1) / QUALITY_PROBE_FPS
+
+    # Optional dedupe against the last kept frame
+    novelty = None
+    if reference is not None:
+        novelty = np.abs(frames - reference).mean(axis=(1, 2))
+    return brightness, sharpness, difference, still_seconds, novelty
+
+
+# Remote (HTTP) sources are read in fixed-size blocks through a local cache, so the index atoms
+# and any range read again by a later ffmpeg call are fetched from the server only once.
+HTTP_BLOCK_SIZE = 1024 * 1024
+HTTP_CACHE_MAX_BLOCKS = 256     # 256 MB of cached blocks on disk
+HTTP_BLOCK_LOCKS = 64           # fetches of blocks sharing a lock are serialised
+HTTP_WARMUP_SECONDS = 0.5       # how far past the next sample's timestamp its packets are pulled in
+HTTP_TIMEOUT = 30
+
+
+class RangeCache:
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.scheme = parts.scheme.lower()
+        self.netloc = parts.netloc
+        self.path = parts.path + (f"?{parts.query}" if parts.query else "")
+        self.local = threading.local()
+        # Probe the origin before creating anything that would need cleaning up when it fails
+        self.size = self.fetch_size()
+        self.blocks = OrderedDict()
+        self.block_locks = [threading.Lock() for _ in range(HTTP_BLOCK_LOCKS)]
+        self.lock = threading.Lock()
+        self.cache_dir = tempfile.mkdtemp(prefix="vidframefetcher_")
+
+    def connection(self):
+        # One keep-alive connection per thread, reused for every range it fetches
+        conn = getattr(self.local, "connection", None)
+        if conn is None:
+            if self.scheme == "https":
+                conn = http.client.HTTPSConnection(self.netloc, timeout=HTTP_TIMEOUT)
+            else:
+                conn = http.client.HTTPConnection(self.netloc, timeout=HTTP_TIMEOUT)
+            self.local.connection = conn
+        return conn
+
+    def drop_connection(self):
+        conn = getattr(self.local, "connection", None)
+        if conn is not None:
+            conn.close()
+        self.local.connection = None
+
+    def request(self, method, headers):
+        # Retry once on a fresh connection if the server dropped the idle one
+        for attempt in range(2):
+            conn = self.connection()
+            try:
+                conn.request(method, self.path, headers=headers)
+                return conn.getresponse()
+            except (http.client.HTTPException, OSError):
+                self.drop_connection()
+                if attempt:
+                    raise
+
+    def fetch_range(self, start, end):
+        response = self.request("GET", {"Range": f"bytes={start}-{end}"})
+        content_range = response.getheader("Content-Range")
+        if response.status != 206 or not content_range:
+            # Never read the body here: a server that ignores Range sends the whole file
+            self.drop_connection()
+            raise IOError(f"Range request {start}-{end} failed, the server may not support "
+                          f"range requests (HTTP {response.status}).")
+        try:
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            self.drop_connection()
+            raise
+
+        # An object that changed since the size probe can come back shorter than asked for
+        if not content_range.startswith(f"bytes {start}-{end}/") or len(data) != end - start + 1:
+            raise IOError(f"Range request {start}-{end} returned {content_range} with {len(data)} bytes.")
+        return content_range, data
+
+    def fetch_size(self):
+        content_range, _ = self.fetch_range(0, 0)
+        return int(content_range.split("/")[1])
+
+    def fetch(self, start, end):
+        _, data = self.fetch_range(start, end)
+        return data
+
+    def block(self, index):
+        # A reader of a block that is being fetched waits for that fetch instead of fetching it again
+        with self.block_locks[index % HTTP_BLOCK_LOCKS]:
+            data = self.cached(index)
+            if data is None:
+                start = index * HTTP_BLOCK_SIZE
+                end = min(self.size, start + HTTP_BLOCK_SIZE) - 1
+                data = self.fetch(start, end)
+                self.store(index, data)
+        return data
+
+    def cached(self, index):
+        with self.lock:
+            block_path = self.blocks.get(index)
+            if block_path is None:
+                return None
+            self.blocks.move_to_end(index)
+        try:
+            with open(block_path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # Evicted since the lookup
+            return None
+
+    def store(self, index, data):
+        block_path = os.path.join(self.cache_dir, f"block_{index}")
+        with open(block_path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(block_path + ".tmp", block_path)
+        with self.lock:
+            self.blocks[index] = block_path
+            evicted_paths = []
+            while len(self.blocks) > HTTP_CACHE_MAX_BLOCKS:
+                evicted_paths.append(self.blocks.popitem(last=False)[1])
+        for evicted_path in evicted_paths:
+            try:
+                os.remove(evicted_path)
+            except OSError:
+                # Still open by a reader on Windows; removed with the cache directory
+                pass
+
+    def close(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+class RangeCacheRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+    def parse_range(self, header):
+        # Returns (start, end), None for a range outside the file, and raises ValueError on a malformed header
+        size = self.server.cache.size
+        unit, _, spec = header.partition("=")
+        first, separator, last = spec.strip().partition("-")
+        if unit.strip().lower() != "bytes" or not separator or "," in spec:
+            raise ValueError(header)
+
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            # Suffix range: the last N bytes of the file
+            length = int(last)
+            if length <= 0:
+                return None
+            start = max(size - length, 0)
+            end = size - 1
+
+        if start < 0 or start > end or start >= size:
+            return None
+        return start, end
+
+    def send_empty_response(self, status, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(self.server.cache.size))
+        self.end_headers()
+
+    def do_GET(self):
+        cache = self.server.cache
+        header = self.headers.get("Range")
+        if header:
+            try:
+                byte_range = self.parse_range(header)
+            except ValueError:
+                self.send_empty_response(400)
+                return
+            if byte_range is None:
+                self.send_empty_response(416, [("Content-Range", f"bytes */{cache.size}")])
+                return
+            start, end = byte_range
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{cache.size}")
+        else:
+            start, end = 0, cache.size - 1
+            self.send_response(200)
+
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+
+        position = start
+        try:
+            while position <= end:
+                index = position // HTTP_BLOCK_SIZE
+                data = cache.block(index)
+                offset = position - index * HTTP_BLOCK_SIZE
+                chunk = data[offset:offset + end - position + 1]
+                if not chunk:
+                    raise IOError(f"Block {index} has no data at offset {offset}.")
+                self.wfile.write(chunk)
+                position += len(chunk)
+        except (http.client.HTTPException, OSError) as e:
+            # ffmpeg closes the connection when it seeks elsewhere; origin errors end the response early
+            logging.debug(f"Range response {start}-{end} ended at {position}: {e}")
+            self.close_connection = True
+
+
+class RangeCacheProxy:
+    # Local http server that ffmpeg reads from, backed by a RangeCache of the remote video
+    def __init__(self, url):
+        self.url = url
+        self.cache = RangeCache(url)
+        try:
+            self.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeCacheRequestHandler)
+        except OSError:
+            self.cache.close()
+            raise
+        self.server.daemon_threads = True
+        self.server.cache = self.cache
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        # Keep the original file name so ffmpeg can still guess the container from it
+        file_name = quote(unquote(os.path.basename(urlsplit(self.url).path)))
+        return f"http://127.0.0.1:{self.server.server_port}/{file_name}"
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache.close()
+
+
+def warm_range_cache(video_path, start, end):
+    # Demux, without decoding, the packets a sample between start and end needs, so they are
+    # already in the range cache when the sample is extracted
+    cmd = ["ffprobe", "-v", "error", "-select_streams", "v:0", "-read_intervals", f"{start}%{end}",
+           "-show_entries", "packet=pos", "-of", "csv=p=0", *ffmpeg_input(video_path)]
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=subprocess.CREATE_NO_WINDOW)
+
+
+# Output writer. Encoded frames are handed to a background thread that writes them in batches,
+# so disk latency never stalls decoding. Syncing happens at the end of each batch: file data still
+# needs one fsync per file, but directories and SQLite transactions are synced once per batch.
+FRAME_WRITER_BATCH_SIZE = 32
+FRAME_WRITER_BATCH_DELAY = 0.5  # seconds to wait for more frames before writing a partial batch
+FRAME_WRITER_QUEUE_SIZE = 64    # frames waiting to be written before the extractor blocks
+FRAME_SINK_SHARDS = 256         # subdirectories used by the sharded sink
+FRAME_SINKS = ["directory", "sharded", "sqlite"]
+FRAME_SINK_DATABASE = "frames.sqlite"
+
+
+def fsync_directory(path):
+    # Makes renames inside the directory durable. Windows can't open directories, and NTFS journals renames itself.
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class DirectorySink:
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+
+    def location(self, name):
+        return name
+
+    def path(self, name):
+        return os.path.join(self.output_dir, self.location(name))
+
+    def write_batch(self, items):
+        # Frames go to temp files first and are renamed into place once synced, so a crash never leaves a
+        # truncated frame under its final name. The whole batch is written before the per-file syncs, letting
+        # the OS flush it together, and the directories are synced once per batch to keep the renames.
+        renames = []
+        try:
+            for name, data in items:
+                final_path = self.path(name)
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                temp_path = f"{final_path}.{socket.gethostname()}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                renames.append((temp_path, final_path))
+
+            for temp_path, _ in renames:
+                fd = os.open(temp_path, os.O_RDWR)
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+        except OSError:
+            for temp_path, _ in renames:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+            raise
+
+        for temp_path, final_path in renames:
+            os.replace(temp_path, final_path)
+        for directory in {os.path.dirname(final_path) for _, final_path in renames}:
+            fsync_directory(directory)
+
+    def close(self):
+        pass
+
+
+class ShardedDirectorySink(DirectorySink):
+    # Spreads frames over subdirectories so no single directory ends up with millions of entries
+    def location(self, name):
+        shard = zlib.crc32(name.encode()) % FRAME_SINK_SHARDS
+        return os.path.join(f"{shard:02x}", name)
+
+
+class SqliteSink:
+    # Stores frames as blobs in one database file; each batch is a single transaction
+    def __init__(self, output_dir):
+        self.database_path = os.path.join(output_dir, FRAME_SINK_DATABASE)
+        self.connection = None
+
+    def location(self, name):
+        return name
+
+    def path(self, name):
+        return None
+
+    def write_batch(self, items):
+        # Connect lazily so the connection belongs to the writer thread
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.database_path, timeout=60)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS frames (name TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO frames (name, data) VALUES (?, ?)", items)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def make_frame_sink(output_sink, output_dir):
+    if output_sink == "sharded":
+        return ShardedDirectorySink(output_dir)
+    elif output_sink == "sqlite":
+        return SqliteSink(output_dir)
+    return DirectorySink(output_dir)
+
+
+def frame_sink_manifest(output_sink):
+    # Tells readers of a manifest where the frame files named in it are stored
+    if output_sink == "sqlite":
+        return {"output_sink": output_sink, "database": FRAME_SINK_DATABASE}
+    return {"output_sink": output_sink}
+
+
+class AsyncFrameWriter:
+    def __init__(self, sink, on_written=None):
+        self.sink = sink
+        self.on_written = on_written
+        self.queue = queue.Queue(maxsize=FRAME_WRITER_QUEUE_SIZE)
+        self.error = None
+        self.written = set()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def write(self, name, data):
+        # Returns False once the writer has failed; the error is kept in self.error
+        if self.error is not None:
+            return False
+        self.queue.put((name, data))
+        return True
+
+    def next_batch(self):
+        # Block for the first frame, then collect more until the batch is full or the delay runs out
+        item = self.queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = monotonic() + FRAME_WRITER_BATCH_DELAY
+        while len(batch) < FRAME_WRITER_BATCH_SIZE:
+            try:
+                item = self.queue.get(timeout=max(0, deadline - monotonic()))
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def run(self):
+        # After an error keep draining the queue, so the extractor never blocks on a full queue
+        finished = False
+        while not finished:
+            batch, finished = self.next_batch()
+            if not batch or self.error is not None:
+                continue
+            try:
+                self.sink.write_batch(batch)
+                self.written.update(name for name, _ in batch)
+                if self.on_written:
+                    for name, _ in batch:
+                        self.on_written(name)
+            except Exception as e:
+                logging.error(f"Error on writing {len(batch)} frames: {e}")
+                self.error = e
+        try:
+            self.sink.close()
+        except Exception as e:
+            logging.error(f"Error on closing the frame sink: {e}")
+            if self.error is None:
+                self.error = e
+
+    def close(self):
+        # Flush everything still queued; safe to call more than once
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+
+
 class FrameExtractorWorker(QThread):
     # Signals
     update_progress_signal = pyqtSignal(int)
@@ -82,9 +596,12 @@ class FrameExtractorWorker(QThread):
 
 
 
-    def __init__(self, video_path, output_dir, interval, frame_name, output_format, resolution, use_gpu=False, gpu_method=""):
+    def __init__(self, video_path, output_dir, interval, frame_name, output_format, resolution, use_gpu=False, gpu_method="",
+                 quality_filter=False, quality_window=0, first_index=0, stop_index=None, manifest_name="manifest.json",
+                 output_sink="directory", quality_dedupe=False, quality_frozen=False):
         super().__init__()
         self.video_path = video_path
+        self.source_path = video_path
         self.output_dir = output_dir
         self.interval = interval
         self.frame_name = frame_name
@@ -93,30 +610,175 @@ class FrameExtractorWorker(QThread):
         self.cancel_extraction = False
         self.use_gpu = use_gpu
         self.gpu_method = gpu_method
+        self.quality_filter = quality_filter
+        self.quality_window = quality_window
+        self.quality_dedupe = quality_dedupe
+        self.quality_frozen = quality_frozen
+        self.first_index = first_index
+        self.stop_index = stop_index
+        self.manifest_name = manifest_name
+        self.manifest = None
+        self.output_sink = output_sink
+        self.writer = None
+        self.frames_previewed = 0
+        self.warmup = None
         
+    def probe_span(self, timestamp, video_duration):
+        # The candidates come from the search window; the frozen check needs to see a longer stretch
+        half_span = self.quality_window / 2
+        if self.quality_frozen:
+            half_span = max(half_span, QUALITY_FROZEN_SECONDS / 2 + 1 / QUALITY_PROBE_FPS)
+        start = max(0, timestamp - half_span)
+        end = min(video_duration, timestamp + half_span)
+        return start, end
+
+    def pick_quality_frame(self, timestamp, video_duration, reference):
+        # Look at every probe frame in the window around the timestamp and keep the sharpest one that passes
+        start, end = self.probe_span(timestamp, video_duration)
+        # At least two probe frames so the frame-to-frame difference exists even without a window
+        duration = max(end - start, 2 / QUALITY_PROBE_FPS)
+        timestamps, frames = read_probe_frames(self.source_path, start, duration)
+        if len(frames) == 0:
+            return None, None, {"status": "dropped", "reason": "unreadable"}
+
+        brightness, sharpness, difference, still_seconds, novelty = score_probe_frames(
+            frames, reference if self.quality_dedupe else None)
+        frozen = still_seconds >= QUALITY_FROZEN_SECONDS if self.quality_frozen else np.zeros(len(frames), dtype=bool)
+        in_window = np.abs(timestamps - timestamp) <= max(self.quality_window / 2, 1 / QUALITY_PROBE_FPS)
+        passed = in_window & (brightness >= QUALITY_MIN_BRIGHTNESS) & (sharpness >= QUALITY_MIN_SHARPNESS) & ~frozen
+        if novelty is not None:
+            passed &= novelty >= QUALITY_MIN_NOVELTY
+
+        if passed.any():
+            best = int(np.argmax(np.where(passed, sharpness, -np.inf)))
+            status, reason = "kept", None
+        else:
+            # Report the scores of the candidate closest to the requested timestamp
+            best = int(np.argmin(np.abs(timestamps - timestamp)))
+            if brightness[best] < QUALITY_MIN_BRIGHTNESS:
+                reason = "black"
+            elif sharpness[best] < QUALITY_MIN_SHARPNESS:
+                reason = "blurred"
+            elif frozen[best]:
+                reason = "frozen"
+            else:
+                reason = "duplicate"
+            status = "dropped"
+
+        scores = {
+            "status": status,
+            "reason": reason,
+            "brightness": round(float(brightness[best]), 2),
+            "sharpness": round(float(sharpness[best]), 2),
+            "difference": None if np.isinf(difference[best]) else round(float(difference[best]), 2),
+            "still_seconds": round(float(still_seconds[best]), 2),
+            "novelty": None if novelty is None else round(float(novelty[best]), 2),
+        }
+        if status == "dropped":
+            return None, None, scores
+        return float(timestamps[best]), frames[best], scores
+
+    def write_manifest(self, manifest):
+        manifest_path = os.path.join(self.output_dir, self.manifest_name)
+        write_json_atomic(manifest_path, {"video": self.video_path, "interval": self.interval,
+                                          "quality_filter": self.quality_filter,
+                                          **frame_sink_manifest(self.output_sink), "frames": manifest})
+
 
     def run(self):
+        # Remote videos are read through a local caching proxy shared by every ffmpeg call of this run
+        proxy = None
+        if is_url(self.video_path):
+            try:
+                proxy = RangeCacheProxy(self.video_path)
+            except (http.client.HTTPException, OSError) as e:
+                error_msg = f"Couldn't open {self.video_path}: {e}"
+                print(error_msg)
+                logging.error(error_msg)
+                self.update_status_signal.emit(error_msg)
+                return
+            self.source_path = proxy.start()
+
+        try:
+            self.extract_frames()
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+            if self.warmup is not None:
+                self.warmup.join()
+            if proxy is not None:
+                proxy.stop()
+
+    def warm_next_sample(self, timestamp, video_duration):
+        # Pull the next sample's byte ranges through the proxy while the current one is encoded
+        if self.warmup is not None:
+            self.warmup.join()
+        start, end = self.probe_span(timestamp, video_duration) if self.quality_filter else (timestamp, timestamp)
+        end = min(video_duration, end + HTTP_WARMUP_SECONDS)
+        self.warmup = threading.Thread(target=warm_range_cache, args=(self.source_path, start, end), daemon=True)
+        self.warmup.start()
+
+    def frame_written(self, name):
+        # Called from the writer thread once a frame is safely stored
+        frame_path = self.writer.sink.path(name)
+        if frame_path is None:
+            return
+        self.frames_previewed += 1
+
+        # Emit signal for the first frame only once
+        if self.frames_previewed == 1:
+            self.first_frame_signal.emit(frame_path)
+
+        # Emit signal for the last frame after every write
+        self.last_frame_signal.emit(frame_path)
+
+    def extract_frames(self):
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
-        video_duration = get_video_duration(self.video_path)
+        video_duration = get_video_duration(self.source_path)
         if video_duration is None:
             error_msg = "Couldn't determine video duration. Exiting."
             print(error_msg)
             logging.error(error_msg)
+            self.update_status_signal.emit(error_msg)
             return
 
         num_screenshots = int(video_duration) // self.interval
+        stop_index = num_screenshots if self.stop_index is None else min(self.stop_index, num_screenshots)
         start_time = time()
+        manifest = []
+        frames_written = 0
+        last_probe = None
+        self.writer = AsyncFrameWriter(make_frame_sink(self.output_sink, self.output_dir), on_written=self.frame_written)
 
-        for i in range(num_screenshots):
+        for i in range(self.first_index, stop_index):
             if self.cancel_extraction:
                 self.update_status_signal.emit("Extraction Cancelled!")
                 break
 
+            if is_url(self.source_path) and i + 1 < stop_index:
+                self.warm_next_sample((i + 1) * self.interval, video_duration)
+
             timestamp = i * self.interval
             base_name = self.frame_name if self.frame_name else "frame"
-            output_file = os.path.join(self.output_dir, f"{base_name}_{i:03d}.{self.output_format}")
+            output_name = f"{base_name}_{i:03d}.{self.output_format}"
+            entry = {"index": i, "requested_timestamp": timestamp}
+
+            if self.quality_filter:
+                chosen_timestamp, probe, scores = self.pick_quality_frame(timestamp, video_duration, last_probe)
+                entry.update(scores)
+                if chosen_timestamp is None:
+                    logging.info(f"Skipped frame {i} at {timestamp}s ({scores['reason']}).")
+                    entry["file"] = None
+                    manifest.append(entry)
+                    self.emit_progress(i, num_screenshots, video_duration, start_time)
+                    continue
+                timestamp = chosen_timestamp
+                last_probe = probe
+            else:
+                entry["status"] = "kept"
+            entry["timestamp"] = timestamp
 
             # Determine the codec based on the selected format
             codec = self.output_format
@@ -130,7 +792,7 @@ class FrameExtractorWorker(QThread):
                 codec = "tiff"
 
             width, height = self.resolution.split("x")
-            cmd = ["ffmpeg", "-ss", str(timestamp), "-i", self.video_path, "-vf", f"scale={width}:{height}", "-vframes", "1", "-c:v", codec, "-an", output_file]
+            cmd = ["ffmpeg", "-ss", str(timestamp), *ffmpeg_input(self.source_path), "-vf", f"scale={width}:{height}", "-vframes", "1", "-c:v", codec, "-an", "-f", "image2pipe", "-"]
 
 
 
@@ -155,34 +817,363 @@ class FrameExtractorWorker(QThread):
                     cmd.insert(2, "vulkan")
 
                     
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, creationflags=subprocess.CREATE_NO_WINDOW)
-            if result.returncode != 0:
-                error_msg = f"Error on extracting frame {i}: {result.stderr}"
+            # The encoded frame comes back on stdout and is handed to the writer thread
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=subprocess.CREATE_NO_WINDOW)
+            if result.returncode != 0 or not result.stdout:
+                error_msg = f"Error on extracting frame {i}: {result.stderr.decode(errors='replace')}"
                 print(error_msg)
                 logging.error(error_msg)
+                entry["status"] = "failed"
+                entry["file"] = None
+            elif self.writer.write(output_name, result.stdout):
+                entry["file"] = self.writer.sink.location(output_name)
+                frames_written += 1
+            else:
+                # The writer has failed; stop here and report it below
+                entry["status"] = "failed"
+                entry["file"] = None
+                manifest.append(entry)
+                break
+
+            manifest.append(entry)
 
             # Emit signals for UI updates
-            elapsed_time = time() - start_time
-            remaining_time = ((video_duration - (i * self.interval)) / self.interval) * (elapsed_time / (i+1))
-            self.update_progress_signal.emit(int((i + 1) / num_screenshots * 100))
-            self.update_status_signal.emit(f"Elapsed Time: {int(elapsed_time)}s | Time Remaining: {int(remaining_time)}s")
-            self.update_frames_signal.emit(f"Frames Created: {i+1}/{num_screenshots}")
-
-            # Emit signal for the first frame only once
-            if i == 0:
-                self.first_frame_signal.emit(output_file)
-
-            # Emit signal for the last frame after every extraction
-            self.last_frame_signal.emit(output_file)
+            self.emit_progress(i, num_screenshots, video_duration, start_time)
+
+        # Make sure every frame is stored before the manifest refers to it
+        self.writer.close()
+        if self.writer.error is not None:
+            error_msg = f"Error on writing frames, extraction stopped: {self.writer.error}"
+            print(error_msg)
+            logging.error(error_msg)
+            self.update_status_signal.emit(error_msg)
+            for entry in manifest:
+                if entry.get("file") and os.path.basename(entry["file"]) not in self.writer.written:
+                    entry["status"] = "failed"
+                    entry["file"] = None
+                    frames_written -= 1
+
+        self.manifest = manifest
+        if self.manifest_name:
+            self.write_manifest(manifest)
             
-        if not self.cancel_extraction:
-            self.extraction_completed_signal.emit(num_screenshots, self.output_dir)
+        if not self.cancel_extraction and self.writer.error is None:
+            self.extraction_completed_signal.emit(frames_written, self.output_dir)
+
+    def emit_progress(self, i, num_screenshots, video_duration, start_time):
+        elapsed_time = time() - start_time
+        remaining_time = ((video_duration - (i * self.interval)) / self.interval) * (elapsed_time / (i+1))
+        self.update_progress_signal.emit(int((i + 1) / num_screenshots * 100))
+        self.update_status_signal.emit(f"Elapsed Time: {int(elapsed_time)}s | Time Remaining: {int(remaining_time)}s")
+        self.update_frames_signal.emit(f"Frames Created: {i+1}/{num_screenshots}")
 
 
 
     def stop(self):
         self.cancel_extraction = True
 
+# Distributed extraction. Jobs are split into shards of consecutive frame indices and written to a
+# spool directory on shared storage; any number of worker processes on any number of machines lease
+# shards with exclusive-create lock files, keep them alive with heartbeats and take over stale ones.
+SPOOL_SHARD_FRAMES = 50
+SPOOL_LEASE_TIMEOUT = 120       # seconds without a heartbeat before a lease counts as stale
+SPOOL_HEARTBEAT_INTERVAL = 15
+SPOOL_POLL_INTERVAL = 5
+
+
+def spool_paths(spool_dir):
+    paths = {name: os.path.join(spool_dir, name) for name in ("tasks", "leases", "done")}
+    for path in paths.values():
+        os.makedirs(path, exist_ok=True)
+    return paths
+
+
+def submit_spool_job(spool_dir, video_path, output_dir, interval, frame_name, output_format, resolution,
+                     quality_filter=False, quality_window=0, shard_frames=SPOOL_SHARD_FRAMES, output_sink="directory",
+                     quality_dedupe=False, quality_frozen=False):
+    if output_sink == "sqlite":
+        # SQLite locking is unreliable on network filesystems, so workers must not share one database
+        raise ValueError("The sqlite output sink can't be used for spool jobs, use directory or sharded.")
+
+    # Workers on other machines run from other directories, so only absolute paths mean the same thing there
+    if not is_url(video_path):
+        video_path = os.path.abspath(video_path)
+    output_dir = os.path.abspath(output_dir)
+
+    video_duration = get_video_duration(video_path)
+    if video_duration is None:
+        raise ValueError(f"Couldn't determine video duration of {video_path}.")
+
+    paths = spool_paths(spool_dir)
+    num_screenshots = int(video_duration) // interval
+    job_id = uuid4().hex[:12]
+    shard_starts = range(0, num_screenshots, shard_frames)
+    for first_index in shard_starts:
+        task = {
+            "job_id": job_id,
+            "num_shards": len(shard_starts),
+            "first_index": first_index,
+            "stop_index": min(first_index + shard_frames, num_screenshots),
+            "video_path": video_path,
+            "output_dir": output_dir,
+            "interval": interval,
+            "frame_name": frame_name,
+            "output_format": output_format,
+            "resolution": resolution,
+            "quality_filter": quality_filter,
+            "quality_window": quality_window,
+            "quality_dedupe": quality_dedupe,
+            "quality_frozen": quality_frozen,
+            "output_sink": output_sink,
+        }
+        write_json_atomic(os.path.join(paths["tasks"], f"{job_id}.{first_index:06d}.json"), task)
+
+    logging.info(f"Submitted job {job_id}: {num_screenshots} frames in {len(shard_starts)} shards.")
+    return job_id
+
+
+class SpoolWorker:
+    def __init__(self, spool_dir):
+        self.paths = spool_paths(spool_dir)
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+    def lease_path(self, task_name):
+        return os.path.join(self.paths["leases"], task_name + ".lease")
+
+    def lease_owner(self, task_name):
+        try:
+            with open(self.lease_path(task_name)) as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def acquire(self, task_name):
+        lease_path = self.lease_path(task_name)
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return self.recover_stale_lease(task_name)
+        with os.fdopen(fd, "w") as f:
+            f.write(self.worker_id)
+        return True
+
+    def spool_time(self):
+        # Lease times are set by the file server, so read the current time from the same clock
+        # instead of comparing them with this host's clock
+        clock_path = os.path.join(self.paths["leases"], f".clock.{self.worker_id}")
+        with open(clock_path, "w"):
+            pass
+        try:
+            return os.path.getmtime(clock_path)
+        finally:
+            os.remove(clock_path)
+
+    def recover_stale_lease(self, task_name):
+        lease_path = self.lease_path(task_name)
+        now = self.spool_time()
+        try:
+            if now - os.path.getmtime(lease_path) < SPOOL_LEASE_TIMEOUT:
+                return False
+            # Renaming is atomic, so only one worker can move a stale lease out of the way
+            stale_path = f"{lease_path}.{self.worker_id}.stale"
+            os.rename(lease_path, stale_path)
+        except FileNotFoundError:
+            return False
+
+        if now - os.path.getmtime(stale_path) < SPOOL_LEASE_TIMEOUT:
+            # Another worker replaced the stale lease in between; put its fresh lease back
+            try:
+                os.link(stale_path, lease_path)
+            except FileExistsError:
+                pass
+            os.remove(stale_path)
+            return False
+
+        os.remove(stale_path)
+        logging.warning(f"Recovered stale lease on {task_name}.")
+        try:
+            fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            f.write(self.worker_id)
+        return True
+
+    def release(self, task_name):
+        if self.lease_owner(task_name) == self.worker_id:
+            os.remove(self.lease_path(task_name))
+
+    def heartbeat(self, task_name, extractor, stopped, lost):
+        while not stopped.wait(SPOOL_HEARTBEAT_INTERVAL):
+            try:
+                if self.lease_owner(task_name) != self.worker_id:
+                    raise FileNotFoundError(self.lease_path(task_name))
+                os.utime(self.lease_path(task_name))
+            except FileNotFoundError:
+                # Our lease was taken over, so another worker is redoing this shard
+                logging.warning(f"Lost lease on {task_name}, stopping.")
+                lost.set()
+                extractor.stop()
+                return
+
+    def record_result(self, task_name, frames):
+        result = {"worker": self.worker_id, "failed": frames is None, "frames": frames or []}
+        write_json_atomic(os.path.join(self.paths["done"], task_name), result)
+        self.release(task_name)
+
+    def process(self, task_name):
+        with open(os.path.join(self.paths["tasks"], task_name)) as f:
+            task = json.load(f)
+
+        logging.info(f"Worker {self.worker_id} extracting frames {task['first_index']}-{task['stop_index'] - 1} "
+                     f"of job {task['job_id']}.")
+        extractor = FrameExtractorWorker(
+            task["video_path"],
+            task["output_dir"],
+            task["interval"],
+            task["frame_name"],
+            task["output_format"],
+            task["resolution"],
+            quality_filter=task["quality_filter"],
+            quality_window=task["quality_window"],
+            first_index=task["first_index"],
+            stop_index=task["stop_index"],
+            manifest_name=None,
+            output_sink=task.get("output_sink", "directory"),
+            quality_dedupe=task.get("quality_dedupe", False),
+            quality_frozen=task.get("quality_frozen", False)
+        )
+
+        stopped = threading.Event()
+        lost = threading.Event()
+        heartbeat = threading.Thread(target=self.heartbeat, args=(task_name, extractor, stopped, lost), daemon=True)
+        heartbeat.start()
+        try:
+            extractor.run()
+        except Exception:
+            logging.exception(f"Shard {task_name} failed.")
+        finally:
+            stopped.set()
+            heartbeat.join()
+
+        if lost.is_set():
+            return
+
+        self.record_result(task_name, extractor.manifest)
+        self.merge_job(task)
+
+    def record_failure(self, task_name):
+        # Record the shard as failed instead of letting it take down every worker that picks it up,
+        # and merge the job so a failing last shard doesn't leave it without a manifest
+        try:
+            if os.path.exists(os.path.join(self.paths["done"], task_name)):
+                self.release(task_name)
+            else:
+                self.record_result(task_name, None)
+            with open(os.path.join(self.paths["tasks"], task_name)) as f:
+                self.merge_job(json.load(f))
+        except Exception:
+            logging.exception(f"Couldn't record failure of shard {task_name}.")
+
+    def merge_job(self, task):
+        # Whichever worker finishes the last shard writes the combined manifest. If two finish at
+        # the same moment they both write identical content, so the atomic rename keeps it consistent.
+        prefix = task["job_id"] + "."
+        done_names = sorted(name for name in os.listdir(self.paths["done"])
+                            if name.startswith(prefix) and name.endswith(".json"))
+        if len(done_names) < task["num_shards"]:
+            return
+
+        frames = []
+        failed_shards = []
+        for name in done_names:
+            with open(os.path.join(self.paths["done"], name)) as f:
+                result = json.load(f)
+            frames.extend(result["frames"])
+            if result["failed"]:
+                failed_shards.append(name)
+        frames.sort(key=lambda entry: entry["index"])
+
+        write_json_atomic(os.path.join(task["output_dir"], "manifest.json"), {
+            "video": task["video_path"],
+            "interval": task["interval"],
+            "quality_filter": task["quality_filter"],
+            **frame_sink_manifest(task.get("output_sink", "directory")),
+            "job_id": task["job_id"],
+            "failed_shards": failed_shards,
+            "frames": frames,
+        })
+        logging.info(f"Job {task['job_id']} completed, manifest written to {task['output_dir']}.")
+
+    def pending_tasks(self):
+        return [name for name in sorted(os.listdir(self.paths["tasks"]))
+                if name.endswith(".json") and not os.path.exists(os.path.join(self.paths["done"], name))]
+
+    def run(self, wait=False):
+        # Keep going until every shard in the spool is done, or forever when waiting for new jobs
+        logging.info(f"Spool worker {self.worker_id} started.")
+        while True:
+            pending = self.pending_tasks()
+            if not pending and not wait:
+                break
+
+            worked = False
+            for task_name in pending:
+                acquired = False
+                try:
+                    acquired = self.acquire(task_name)
+                    if not acquired:
+                        continue
+                    # The shard may have been finished by another worker since we listed the spool
+                    if os.path.exists(os.path.join(self.paths["done"], task_name)):
+                        self.release(task_name)
+                        continue
+                    worked = True
+                    self.process(task_name)
+                except Exception:
+                    # A spool that is briefly unreachable shouldn't stop the worker either
+                    logging.exception(f"Shard {task_name} failed.")
+                    if acquired:
+                        self.record_failure(task_name)
+
+            if not worked:
+                sleep(SPOOL_POLL_INTERVAL)
+        logging.info(f"Spool worker {self.worker_id} finished.")
+
+
+def run_command_line(argv):
+    parser = argparse.ArgumentParser(description="Distributed frame extraction through a shared spool directory.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = subparsers.add_parser("submit", help="Split a video into shards and add them to the spool.")
+    submit_parser.add_argument("spool_dir")
+    submit_parser.add_argument("video_path")
+    submit_parser.add_argument("output_dir")
+    submit_parser.add_argument("--interval", type=int, default=10)
+    submit_parser.add_argument("--frame-name", default="")
+    submit_parser.add_argument("--format", default="png", choices=["png", "jpg", "bmp", "tiff"])
+    submit_parser.add_argument("--resolution", default="1920x1080")
+    submit_parser.add_argument("--quality-filter", action="store_true")
+    submit_parser.add_argument("--quality-window", type=int, default=2)
+    submit_parser.add_argument("--quality-dedupe", action="store_true")
+    submit_parser.add_argument("--quality-frozen", action="store_true")
+    submit_parser.add_argument("--shard-frames", type=int, default=SPOOL_SHARD_FRAMES)
+    submit_parser.add_argument("--output-sink", default="directory", choices=["directory", "sharded"])
+
+    worker_parser = subparsers.add_parser("worker", help="Extract shards from the spool until none are left.")
+    worker_parser.add_argument("spool_dir")
+    worker_parser.add_argument("--wait", action="store_true", help="Keep polling for new jobs instead of exiting.")
+
+    args = parser.parse_args(argv)
+    if args.command == "submit":
+        job_id = submit_spool_job(args.spool_dir, args.video_path, args.output_dir, args.interval, args.frame_name,
+                                  args.format, args.resolution, args.quality_filter, args.quality_window,
+                                  args.shard_frames, args.output_sink, args.quality_dedupe, args.quality_frozen)
+        print(job_id)
+    else:
+        SpoolWorker(args.spool_dir).run(wait=args.wait)
+
+
 class FFmpegFrameExtractorApp(QMainWindow):
 
 
@@ -283,6 +1274,14 @@ class FFmpegFrameExtractorApp(QMainWindow):
         format_layout.addWidget(self.resolution_dropdown)
         settings_layout.addLayout(format_layout)
 
+        # Output Sink
+        self.output_sink = QComboBox(self)
+        self.output_sink.addItems(FRAME_SINKS)
+        output_sink_layout = QHBoxLayout()
+        output_sink_layout.addWidget(QLabel("Save Frames To:"))
+        output_sink_layout.addWidget(self.output_sink)
+        settings_layout.addLayout(output_sink_layout)
+
 
 
         
@@ -305,6 +1304,30 @@ class FFmpegFrameExtractorApp(QMainWindow):
 
         gpu_acceleration_group.setLayout(gpu_acceleration_layout)
         settings_layout.addWidget(gpu_acceleration_group)
+
+        # Quality Filter Frame
+        quality_filter_group = QGroupBox("Quality Filter", self)
+        quality_filter_layout = QVBoxLayout()
+
+        self.quality_filter_checkbox = QCheckBox("Skip black, blurred and frozen frames", self)
+        quality_filter_layout.addWidget(self.quality_filter_checkbox)
+
+        self.quality_window_entry = QLineEdit("2", self)
+        self.quality_window_entry.setValidator(QIntValidator(0, 60))  # Seconds searched around each timestamp
+        self.quality_window_entry.setFixedWidth(50)
+        quality_window_layout = QHBoxLayout()
+        quality_window_layout.addWidget(QLabel("Search Window (in seconds):"))
+        quality_window_layout.addWidget(self.quality_window_entry)
+        quality_filter_layout.addLayout(quality_window_layout)
+
+        self.quality_dedupe_checkbox = QCheckBox("Also skip repeats of the previous kept frame", self)
+        quality_filter_layout.addWidget(self.quality_dedupe_checkbox)
+
+        self.quality_frozen_checkbox = QCheckBox(f"Also skip frozen video (no change for {QUALITY_FROZEN_SECONDS:g}s)", self)
+        quality_filter_layout.addWidget(self.quality_frozen_checkbox)
+
+        quality_filter_group.setLayout(quality_filter_layout)
+        settings_layout.addWidget(quality_filter_group)
         
         # Spacer before progress bar
         settings_layout.addStretch(1)
@@ -450,6 +1473,7 @@ class FFmpegFrameExtractorApp(QMainWindow):
         #QComboBox
         self.output_format.setToolTip("Select the format for the extracted frames.")
         self.resolution_dropdown.setToolTip("Select the resolution for the extracted frames.")
+        self.output_sink.setToolTip("Save frames as files, as files spread over subfolders, or into a single SQLite database.")
         self.gpu_accel_method.setToolTip("Select the GPU acceleration method (if GPU acceleration is enabled).")
         
         #QCheckBox
@@ -639,7 +1663,7 @@ class FFmpegFrameExtractorApp(QMainWindow):
         video_path = self.video_path_entry.text()
         output_dir = self.output_dir_entry.text()
 
-        if not video_path or not os.path.exists(video_path):
+        if not video_path or not (is_url(video_path) or os.path.exists(video_path)):
             error_msg = "Please select a valid video file."
             QMessageBox.critical(self, "Error", error_msg)
             logging.error(error_msg)
@@ -651,15 +1675,19 @@ class FFmpegFrameExtractorApp(QMainWindow):
             logging.error(error_msg)
             return
 
-        video_duration = get_video_duration(video_path)
-        if video_duration is None:
-            error_msg = "Couldn't determine video duration. Exiting."
-            QMessageBox.critical(self, "Error", error_msg)
-            logging.error(error_msg)
-            return
+        # Remote videos are probed by the worker through its range cache, keeping the UI responsive
+        if is_url(video_path):
+            logging.info(f"Extraction started for {video_path}.")
+        else:
+            video_duration = get_video_duration(video_path)
+            if video_duration is None:
+                error_msg = "Couldn't determine video duration. Exiting."
+                QMessageBox.critical(self, "Error", error_msg)
+                logging.error(error_msg)
+                return
 
-        num_screenshots = int(video_duration) // int(self.interval_entry.text())
-        logging.info(f"Extraction started for {num_screenshots} frames.")
+            num_screenshots = int(video_duration) // int(self.interval_entry.text())
+            logging.info(f"Extraction started for {num_screenshots} frames.")
             
         resolution = self.resolution_dropdown.currentText().split(" ")[1].replace("(", "").replace(")", "")
         self.worker = FrameExtractorWorker(
@@ -670,7 +1698,12 @@ class FFmpegFrameExtractorApp(QMainWindow):
             self.output_format.currentText(),
             resolution,
             self.gpu_accel_checkbox.isChecked(),
-            self.gpu_accel_method.currentText()
+            self.gpu_accel_method.currentText(),
+            self.quality_filter_checkbox.isChecked(),
+            int(self.quality_window_entry.text() or 0),
+            output_sink=self.output_sink.currentText(),
+            quality_dedupe=self.quality_dedupe_checkbox.isChecked(),
+            quality_frozen=self.quality_frozen_checkbox.isChecked()
         )
 
         # Signals
@@ -732,6 +1765,11 @@ class FFmpegFrameExtractorApp(QMainWindow):
 
 
 if __name__ == '__main__':
+    # Other arguments are Qt options or a file opened with the app, so leave them to the GUI
+    if len(sys.argv) > 1 and sys.argv[1] in ("submit", "worker"):
+        run_command_line(sys.argv[1:])
+        sys.exit(0)
+
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # Set the application style to Fusion
     ex = FFmpegFrameExtractorApp()
@@ -0,0 +1,54 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "VidFrameFetcher 1.0.py")
+MODULE_NAME = "vidframefetcher"
+
+
+def stub_multimedia():
+    # The video preview needs QtMultimedia's native libraries, which headless machines often lack.
+    # Nothing under test plays video, so stand-ins are enough to import the application there.
+    try:
+        import PyQt5.QtMultimedia
+        import PyQt5.QtMultimediaWidgets
+        return
+    except ImportError:
+        pass
+
+    from PyQt5.QtWidgets import QWidget
+
+    multimedia = types.ModuleType("PyQt5.QtMultimedia")
+    multimedia.QMediaPlayer = type("QMediaPlayer", (), {})
+    multimedia.QMediaContent = type("QMediaContent", (), {})
+    multimedia_widgets = types.ModuleType("PyQt5.QtMultimediaWidgets")
+    multimedia_widgets.QVideoWidget = QWidget
+    sys.modules["PyQt5.QtMultimedia"] = multimedia
+    sys.modules["PyQt5.QtMultimediaWidgets"] = multimedia_widgets
+
+
+def load_app():
+    # The script's file name isn't importable, so load it by path. Importing it also starts logging
+    # into ./Logs and redirects stdout/stderr, so run it from a scratch directory and undo the redirect.
+    if MODULE_NAME in sys.modules:
+        return sys.modules[MODULE_NAME]
+
+    stub_multimedia()
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    scratch_dir = os.path.join(tempfile.gettempdir(), "vidframefetcher_tests")
+    os.makedirs(scratch_dir, exist_ok=True)
+
+    cwd = os.getcwd()
+    stdout, stderr, excepthook = sys.stdout, sys.stderr, sys.excepthook
+    os.chdir(scratch_dir)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+        sys.stdout, sys.stderr, sys.excepthook = stdout, stderr, excepthook
+
+    sys.modules[MODULE_NAME] = module
+    return module
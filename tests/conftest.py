@@ -0,0 +1,25 @@
+import subprocess
+
+import pytest
+
+from app_loader import load_app
+
+
+@pytest.fixture(scope="session")
+def app():
+    return load_app()
+
+
+@pytest.fixture
+def fake_ffmpeg(app, monkeypatch):
+    # Every ffmpeg/ffprobe call succeeds with a small "encoded frame"; the commands are recorded
+    commands = []
+
+    def run(cmd, **kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"encoded frame", stderr=b"")
+
+    monkeypatch.setattr(app, "get_video_duration", lambda video_path: 100.0)
+    monkeypatch.setattr(app.subprocess, "run", run)
+    monkeypatch.setattr(app.subprocess, "CREATE_NO_WINDOW", 0, raising=False)
+    return commands
@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+
+def frame_bytes(i):
+    return bytes([i % 256]) * 100
+
+
+def write_frames(app, sink, count):
+    writer = app.AsyncFrameWriter(sink)
+    for i in range(count):
+        assert writer.write(f"frame_{i:03d}.png", frame_bytes(i))
+    writer.close()
+    assert writer.error is None
+    return writer
+
+
+@pytest.mark.parametrize("output_sink", ["directory", "sharded"])
+def test_directory_sinks_store_every_frame(app, tmp_path, output_sink):
+    sink = app.make_frame_sink(output_sink, str(tmp_path))
+    writer = write_frames(app, sink, 100)
+
+    files = [os.path.join(root, name) for root, _, names in os.walk(tmp_path) for name in names]
+    assert len(files) == 100
+    assert not [path for path in files if path.endswith(".tmp")]
+    for i in range(100):
+        with open(sink.path(f"frame_{i:03d}.png"), "rb") as f:
+            assert f.read() == frame_bytes(i)
+    assert len(writer.written) == 100
+
+    subdirectories = {os.path.dirname(path) for path in files}
+    if output_sink == "directory":
+        assert subdirectories == {str(tmp_path)}
+    else:
+        assert len(subdirectories) > 1
+
+
+def test_failed_batch_leaves_no_partial_frames(app, monkeypatch, tmp_path):
+    def fsync(fd):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(app.os, "fsync", fsync)
+    with pytest.raises(OSError, match="disk full"):
+        app.DirectorySink(str(tmp_path)).write_batch([(f"frame_{i:03d}.png", frame_bytes(i)) for i in range(5)])
+    assert os.listdir(tmp_path) == []
+
+
+def test_sqlite_sink_stores_every_frame(app, tmp_path):
+    write_frames(app, app.make_frame_sink("sqlite", str(tmp_path)), 100)
+
+    connection = sqlite3.connect(tmp_path / "frames.sqlite")
+    rows = dict(connection.execute("SELECT name, data FROM frames"))
+    connection.close()
+    assert len(rows) == 100
+    assert rows["frame_042.png"] == frame_bytes(42)
+
+
+def test_writer_error_does_not_block_producer(app, tmp_path):
+    def on_written(name):
+        raise RuntimeError("preview failed")
+
+    writer = app.AsyncFrameWriter(app.make_frame_sink("directory", str(tmp_path)), on_written=on_written)
+    results = [writer.write(f"frame_{i:03d}.png", frame_bytes(i)) for i in range(app.FRAME_WRITER_QUEUE_SIZE * 3)]
+    writer.close()
+
+    assert isinstance(writer.error, RuntimeError)
+    assert results[0]
+    assert not writer.write("late.png", b"x")
+
+
+class FailingSink:
+    def location(self, name):
+        return name
+
+    def path(self, name):
+        return None
+
+    def write_batch(self, items):
+        raise OSError("disk full")
+
+    def close(self):
+        pass
+
+
+def run_extraction(app, output_dir, output_sink="directory"):
+    worker = app.FrameExtractorWorker("clip.mp4", str(output_dir), 10, "", "png", "1920x1080", output_sink=output_sink)
+    statuses = []
+    completed = []
+    worker.update_status_signal.connect(statuses.append)
+    worker.extraction_completed_signal.connect(lambda count, directory: completed.append(count))
+    worker.run()
+    with open(output_dir / "manifest.json") as f:
+        return json.load(f), statuses, completed
+
+
+def test_extraction_writes_frames_through_writer(app, fake_ffmpeg, tmp_path):
+    manifest, _, completed = run_extraction(app, tmp_path)
+
+    assert completed == [10]
+    assert manifest["output_sink"] == "directory"
+    assert "database" not in manifest
+    assert [entry["file"] for entry in manifest["frames"]] == [f"frame_{i:03d}.png" for i in range(10)]
+    assert (tmp_path / "frame_009.png").read_bytes() == b"encoded frame"
+
+
+def test_manifest_names_sqlite_database(app, fake_ffmpeg, tmp_path):
+    manifest, _, completed = run_extraction(app, tmp_path, "sqlite")
+
+    assert completed == [10]
+    assert manifest["output_sink"] == "sqlite"
+    assert manifest["database"] == "frames.sqlite"
+    assert (tmp_path / manifest["database"]).exists()
+
+
+def test_extraction_reports_writer_failure_and_keeps_manifest(app, fake_ffmpeg, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "make_frame_sink", lambda output_sink, output_dir: FailingSink())
+    manifest, statuses, completed = run_extraction(app, tmp_path)
+
+    assert completed == []
+    assert any("disk full" in status for status in statuses)
+    assert manifest["frames"]
+    assert all(entry["status"] == "failed" and entry["file"] is None for entry in manifest["frames"])
+
+
+def test_spool_jobs_reject_sqlite_sink(app, tmp_path):
+    with pytest.raises(ValueError, match="sqlite"):
+        app.submit_spool_job(str(tmp_path / "spool"), "clip.mp4", str(tmp_path / "frames"), 10, "", "png",
+                             "1920x1080", output_sink="sqlite")
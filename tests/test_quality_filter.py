@@ -0,0 +1,118 @@
+import json
+
+import numpy as np
+import pytest
+
+TEXTURE = np.random.default_rng(0).integers(0, 256, (90, 160)).astype(np.float32)
+
+
+def moving(t):
+    # A sharp, bright picture that changes over time
+    return np.roll(TEXTURE, int(t * 4), axis=1)
+
+
+def fake_probe(app, frame_at):
+    def read_probe_frames(video_path, start, duration):
+        timestamps = start + np.arange(int(round(duration * app.QUALITY_PROBE_FPS))) / app.QUALITY_PROBE_FPS
+        return timestamps, np.stack([frame_at(t) for t in timestamps]).astype(np.float32)
+    return read_probe_frames
+
+
+def make_worker(app, tmp_path, **kwargs):
+    options = {"quality_filter": True, "quality_window": 2}
+    options.update(kwargs)
+    return app.FrameExtractorWorker("clip.mp4", str(tmp_path), 10, "", "png", "1920x1080", **options)
+
+
+def test_single_frame_has_no_difference(app):
+    brightness, sharpness, difference, still_seconds, novelty = app.score_probe_frames(TEXTURE[None])
+    assert np.isinf(difference[0])
+    assert still_seconds[0] == 0
+    assert novelty is None
+    assert brightness[0] > app.QUALITY_MIN_BRIGHTNESS
+    assert sharpness[0] > app.QUALITY_MIN_SHARPNESS
+
+
+def test_still_seconds_measures_unchanged_runs(app):
+    static = np.stack([TEXTURE] * 13)
+    assert app.score_probe_frames(static)[3].tolist() == [3.0] * 13
+
+    changing = np.stack([moving(k / app.QUALITY_PROBE_FPS) for k in range(13)])
+    assert app.score_probe_frames(changing)[3].tolist() == [0.0] * 13
+
+
+def test_single_probe_frame_is_kept(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "read_probe_frames", lambda video_path, start, duration: (np.array([start]), TEXTURE[None]))
+    timestamp, _, scores = make_worker(app, tmp_path, quality_window=0).pick_quality_frame(10, 100, None)
+
+    assert timestamp == 10
+    assert scores["status"] == "kept"
+    assert scores["difference"] is None
+
+
+@pytest.mark.parametrize("frame_at, options, reason", [
+    (lambda t: np.zeros_like(TEXTURE), {}, "black"),
+    (lambda t: np.full_like(TEXTURE, 128), {}, "blurred"),
+    (lambda t: TEXTURE, {"quality_frozen": True}, "frozen"),
+    (lambda t: TEXTURE + (t - 9) * 0.4, {"quality_dedupe": True}, "duplicate"),
+])
+def test_dropped_frames_report_reason(app, monkeypatch, tmp_path, frame_at, options, reason):
+    monkeypatch.setattr(app, "read_probe_frames", fake_probe(app, frame_at))
+    timestamp, probe, scores = make_worker(app, tmp_path, **options).pick_quality_frame(10, 100, TEXTURE)
+
+    assert timestamp is None and probe is None
+    assert scores["status"] == "dropped"
+    assert scores["reason"] == reason
+
+
+def test_static_shot_is_kept_without_frozen_check(app, monkeypatch, tmp_path):
+    # A title card or slide doesn't change either, and is only dropped when the frozen check is asked for
+    monkeypatch.setattr(app, "read_probe_frames", fake_probe(app, lambda t: TEXTURE))
+    timestamp, _, scores = make_worker(app, tmp_path).pick_quality_frame(10, 100, None)
+
+    assert timestamp is not None
+    assert scores["status"] == "kept"
+    assert scores["difference"] == 0
+
+
+def test_sharpest_passing_frame_in_window_is_chosen(app, monkeypatch, tmp_path):
+    def frame_at(t):
+        # Contrast, and so sharpness, peaks at 10.5s; an even sharper frame at 8.5s lies outside the window
+        contrast = 2.0 if t == 8.5 else 1 / (1 + abs(t - 10.5))
+        return 128 + (moving(t) - 128) * contrast
+
+    monkeypatch.setattr(app, "read_probe_frames", fake_probe(app, frame_at))
+    timestamp, probe, scores = make_worker(app, tmp_path, quality_frozen=True).pick_quality_frame(10, 100, None)
+
+    assert timestamp == 10.5
+    assert scores["status"] == "kept"
+    assert np.array_equal(probe, frame_at(10.5))
+
+
+def test_manifest_records_quality_scores(app, fake_ffmpeg, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "read_probe_frames",
+                        fake_probe(app, lambda t: np.zeros_like(TEXTURE) if 19 <= t <= 21 else moving(t)))
+    completed = []
+    worker = make_worker(app, tmp_path)
+    worker.extraction_completed_signal.connect(lambda count, directory: completed.append(count))
+    worker.run()
+
+    with open(tmp_path / "manifest.json") as f:
+        manifest = json.load(f)
+    frames = manifest["frames"]
+    assert manifest["quality_filter"] is True
+    assert len(frames) == 10
+    assert completed == [9]
+
+    assert frames[2]["status"] == "dropped"
+    assert frames[2]["reason"] == "black"
+    assert frames[2]["file"] is None
+
+    for entry in frames[:2] + frames[3:]:
+        assert entry["status"] == "kept"
+        assert entry["file"] == f"frame_{entry['index']:03d}.png"
+        assert abs(entry["timestamp"] - entry["requested_timestamp"]) <= 1
+        assert entry["brightness"] >= app.QUALITY_MIN_BRIGHTNESS
+        assert entry["sharpness"] >= app.QUALITY_MIN_SHARPNESS
+        assert entry["difference"] > 0
+        assert entry["still_seconds"] == 0
@@ -0,0 +1,195 @@
+import glob
+import http.client
+import os
+import socket
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+VIDEO_SIZE = 5 * 1024 * 1024 + 123
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    # Stand-in for the object store: serves single byte ranges over keep-alive connections
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        origin = self.server
+        origin.connections.add(self.client_address)
+        header = self.headers.get("Range")
+        origin.requests.append(header)
+
+        if origin.ignore_range or not header:
+            self.send_full_body()
+            return
+
+        start, end = (int(value) for value in header.replace("bytes=", "").split("-"))
+        body = origin.data[start:end + 1]
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(origin.data)}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_full_body(self):
+        # Pretend to be a huge file and count how much of it the client actually takes
+        chunk = b"\0" * (1024 * 1024)
+        self.send_response(200)
+        self.send_header("Content-Length", str(self.server.claimed_size))
+        self.end_headers()
+        try:
+            for _ in range(self.server.claimed_size // len(chunk)):
+                self.wfile.write(chunk)
+                self.server.bytes_sent += len(chunk)
+        except OSError:
+            self.close_connection = True
+
+
+@pytest.fixture
+def origin():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OriginHandler)
+    server.daemon_threads = True
+    server.data = os.urandom(VIDEO_SIZE)
+    server.requests = []
+    server.connections = set()
+    server.ignore_range = False
+    server.claimed_size = 10 * 1024 ** 3
+    server.bytes_sent = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def proxy(app, origin):
+    proxy = app.RangeCacheProxy(f"http://127.0.0.1:{origin.server_port}/videos/clip.mp4")
+    proxy.start()
+    yield proxy
+    proxy.stop()
+
+
+def get(proxy, range_header=None):
+    conn = http.client.HTTPConnection("127.0.0.1", proxy.server.server_port, timeout=10)
+    conn.request("GET", "/clip.mp4", headers={"Range": range_header} if range_header else {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+def test_proxy_url_keeps_file_name(app, origin):
+    proxy = app.RangeCacheProxy(f"http://127.0.0.1:{origin.server_port}/videos/my%20clip.mp4?sig=1")
+    try:
+        assert proxy.start().endswith("/my%20clip.mp4")
+    finally:
+        proxy.stop()
+
+
+def test_ranges_match_origin(proxy, origin):
+    data = origin.data
+    block = 1024 * 1024
+
+    response, body = get(proxy, "bytes=100-200")
+    assert response.status == 206
+    assert response.getheader("Content-Range") == f"bytes 100-200/{VIDEO_SIZE}"
+    assert body == data[100:201]
+
+    # Across a block boundary
+    assert get(proxy, f"bytes={3 * block - 5}-{3 * block + 5}")[1] == data[3 * block - 5:3 * block + 6]
+    # Open-ended and suffix ranges
+    assert get(proxy, f"bytes={VIDEO_SIZE - 1000}-")[1] == data[-1000:]
+    assert get(proxy, "bytes=-500")[1] == data[-500:]
+    assert get(proxy, f"bytes=-{VIDEO_SIZE * 2}")[1] == data
+
+    response, body = get(proxy)
+    assert response.status == 200
+    assert body == data
+
+
+def test_bad_ranges_get_error_responses(proxy):
+    assert get(proxy, "bytes=abc-def")[0].status == 400
+    assert get(proxy, "bytes=0-1,5-6")[0].status == 400
+    assert get(proxy, "items=0-1")[0].status == 400
+
+    response, _ = get(proxy, f"bytes={VIDEO_SIZE}-")
+    assert response.status == 416
+    assert response.getheader("Content-Range") == f"bytes */{VIDEO_SIZE}"
+    assert get(proxy, "bytes=10-5")[0].status == 416
+    assert get(proxy, "bytes=-0")[0].status == 416
+
+
+def test_repeated_ranges_are_served_from_cache(proxy, origin):
+    tail = f"bytes={VIDEO_SIZE - 4096}-"
+    get(proxy, tail)
+    requests_before = len(origin.requests)
+
+    # The index atoms are read again by every ffmpeg call; only the first read reaches the origin
+    for _ in range(3):
+        assert get(proxy, tail)[1] == origin.data[-4096:]
+    assert len(origin.requests) == requests_before
+
+
+def test_blocks_are_fetched_once_and_only_when_read(app, proxy, origin):
+    get(proxy, "bytes=0-10")
+    assert sorted(proxy.cache.blocks) == [0]
+
+    assert get(proxy, "bytes=0-")[1] == origin.data
+    # One size probe plus one request per block
+    block_requests = origin.requests[1:]
+    assert len(block_requests) == len(set(block_requests)) == -(-VIDEO_SIZE // app.HTTP_BLOCK_SIZE)
+
+
+def test_origin_that_shrank_ends_the_response(app, proxy, origin):
+    origin.data = origin.data[:VIDEO_SIZE // 2]
+
+    with pytest.raises(OSError, match="returned"):
+        proxy.cache.fetch(VIDEO_SIZE - 100, VIDEO_SIZE - 1)
+    # The client sees a truncated response instead of a proxy thread spinning forever
+    with pytest.raises(http.client.IncompleteRead):
+        get(proxy, f"bytes={VIDEO_SIZE - 100}-")
+
+
+def test_failed_open_leaves_no_cache_directory(app):
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+
+    before = set(glob.glob(os.path.join(tempfile.gettempdir(), "vidframefetcher_*")))
+    for _ in range(3):
+        with pytest.raises(OSError):
+            app.RangeCacheProxy(f"http://127.0.0.1:{port}/clip.mp4")
+    assert set(glob.glob(os.path.join(tempfile.gettempdir(), "vidframefetcher_*"))) == before
+
+
+def test_worker_warms_next_sample_through_proxy(app, origin, fake_ffmpeg, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "get_video_duration", lambda video_path: 30.0)
+    worker = app.FrameExtractorWorker(f"http://127.0.0.1:{origin.server_port}/clip.mp4", str(tmp_path), 10, "",
+                                      "png", "1920x1080")
+    worker.run()
+
+    warmups = [cmd for cmd in fake_ffmpeg if cmd[0] == "ffprobe"]
+    intervals = [cmd[cmd.index("-read_intervals") + 1] for cmd in warmups]
+    assert intervals == [f"10%{10 + app.HTTP_WARMUP_SECONDS}", f"20%{20 + app.HTTP_WARMUP_SECONDS}"]
+    assert all(cmd[-1].startswith("http://127.0.0.1:") and str(origin.server_port) not in cmd[-1]
+               for cmd in warmups)
+    assert sorted(os.listdir(tmp_path)) == ["frame_000.png", "frame_001.png", "frame_002.png", "manifest.json"]
+
+
+def test_origin_connections_are_reused(proxy, origin):
+    for _ in range(5):
+        get(proxy, "bytes=0-")
+    assert len(origin.connections) < len(origin.requests)
+
+
+def test_origin_without_range_support_is_rejected_without_download(app, origin):
+    origin.ignore_range = True
+    with pytest.raises(OSError, match="range requests"):
+        app.RangeCache(f"http://127.0.0.1:{origin.server_port}/clip.mp4")
+    # Only what fits in socket buffers before the connection was dropped
+    assert origin.bytes_sent < 256 * 1024 * 1024
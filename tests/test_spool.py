@@ -0,0 +1,181 @@
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+from app_loader import load_app
+
+VIDEO_DURATION = 1000.0
+
+
+class FakeExtractor:
+    # Stands in for FrameExtractorWorker so workers can run without ffmpeg
+    def __init__(self, video_path, output_dir, interval, frame_name, output_format, resolution,
+                 first_index=0, stop_index=None, **kwargs):
+        self.video_path = video_path
+        self.first_index = first_index
+        self.stop_index = stop_index
+        self.manifest = None
+        self.cancel_extraction = False
+
+    def stop(self):
+        self.cancel_extraction = True
+
+    def run(self):
+        if self.video_path.endswith("broken.mp4") and self.first_index == 0:
+            raise RuntimeError("decoder crashed")
+        time.sleep(0.2)
+        self.manifest = [{"index": i, "pid": os.getpid()} for i in range(self.first_index, self.stop_index)]
+
+
+def run_worker(spool_dir):
+    app = load_app()
+    app.FrameExtractorWorker = FakeExtractor
+    app.SPOOL_POLL_INTERVAL = 0.1
+    app.SpoolWorker(spool_dir).run()
+
+
+def run_workers(spool_dir, count):
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=run_worker, args=(spool_dir,)) for _ in range(count)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    return [worker.exitcode for worker in workers]
+
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def submit(app, monkeypatch, spool_dir, video_path, output_dir, shard_frames):
+    monkeypatch.setattr(app, "get_video_duration", lambda video_path: VIDEO_DURATION)
+    return app.submit_spool_job(str(spool_dir), video_path, str(output_dir), 10, "", "png", "1920x1080",
+                                shard_frames=shard_frames)
+
+
+def test_submit_stores_absolute_paths(app, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    submit(app, monkeypatch, "spool", "clip.mp4", "frames", 50)
+
+    tasks = sorted(os.listdir(tmp_path / "spool" / "tasks"))
+    assert len(tasks) == 2
+    task = read_json(tmp_path / "spool" / "tasks" / tasks[0])
+    assert task["video_path"] == str(tmp_path / "clip.mp4")
+    assert task["output_dir"] == str(tmp_path / "frames")
+    assert (task["first_index"], task["stop_index"], task["num_shards"]) == (0, 50, 2)
+
+
+def test_workers_share_shards_and_merge_manifest(app, monkeypatch, tmp_path):
+    spool_dir = tmp_path / "spool"
+    output_dir = tmp_path / "frames"
+    output_dir.mkdir()
+    job_id = submit(app, monkeypatch, spool_dir, "https://store/clip.mp4", output_dir, 7)
+
+    # A worker that died while holding the first shard
+    stale_lease = spool_dir / "leases" / f"{job_id}.000000.json.lease"
+    stale_lease.write_text("dead-worker")
+    os.utime(stale_lease, (0, 0))
+
+    assert run_workers(str(spool_dir), 4) == [0, 0, 0, 0]
+
+    manifest = read_json(output_dir / "manifest.json")
+    assert manifest["job_id"] == job_id
+    assert manifest["output_sink"] == "directory"
+    assert manifest["failed_shards"] == []
+    assert [frame["index"] for frame in manifest["frames"]] == list(range(100))
+
+    done = [read_json(spool_dir / "done" / name) for name in os.listdir(spool_dir / "done")]
+    assert len(done) == 15
+    assert len({result["worker"] for result in done}) > 1
+    assert os.listdir(spool_dir / "leases") == []
+
+
+def test_failing_shard_is_recorded_and_workers_keep_going(app, monkeypatch, tmp_path):
+    spool_dir = tmp_path / "spool"
+    output_dir = tmp_path / "frames"
+    output_dir.mkdir()
+    job_id = submit(app, monkeypatch, spool_dir, str(tmp_path / "broken.mp4"), output_dir, 25)
+
+    assert run_workers(str(spool_dir), 2) == [0, 0]
+
+    manifest = read_json(output_dir / "manifest.json")
+    assert manifest["failed_shards"] == [f"{job_id}.000000.json"]
+    assert [frame["index"] for frame in manifest["frames"]] == list(range(25, 100))
+
+
+def test_heartbeat_stops_extraction_when_lease_disappears(app, monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "SPOOL_HEARTBEAT_INTERVAL", 0.01)
+    worker = app.SpoolWorker(str(tmp_path))
+    assert worker.acquire("job.000000.json")
+
+    extractor = FakeExtractor("clip.mp4", "frames", 10, "", "png", "1920x1080")
+    stopped = threading.Event()
+    lost = threading.Event()
+    heartbeat = threading.Thread(target=worker.heartbeat, args=("job.000000.json", extractor, stopped, lost))
+    heartbeat.start()
+    time.sleep(0.05)
+    assert not lost.is_set()
+
+    # Another worker moved the lease aside as stale
+    os.rename(worker.lease_path("job.000000.json"), worker.lease_path("job.000000.json") + ".stale")
+    heartbeat.join(timeout=5)
+    stopped.set()
+    assert lost.is_set()
+    assert extractor.cancel_extraction
+
+
+class BrokenExtractor(FakeExtractor):
+    def __init__(self, video_path, output_dir, interval, frame_name, output_format, resolution,
+                 first_index=0, stop_index=None, **kwargs):
+        if first_index == 75:
+            raise ValueError("bad task")
+        super().__init__(video_path, output_dir, interval, frame_name, output_format, resolution,
+                         first_index=first_index, stop_index=stop_index, **kwargs)
+
+
+def test_worker_survives_spool_errors_and_merges_failed_last_shard(app, monkeypatch, tmp_path):
+    spool_dir = tmp_path / "spool"
+    output_dir = tmp_path / "frames"
+    output_dir.mkdir()
+    job_id = submit(app, monkeypatch, spool_dir, "clip.mp4", output_dir, 25)
+    monkeypatch.setattr(app, "FrameExtractorWorker", BrokenExtractor)
+    monkeypatch.setattr(app, "SPOOL_POLL_INTERVAL", 0.01)
+
+    worker = app.SpoolWorker(str(spool_dir))
+    acquire = worker.acquire
+    attempts = []
+
+    def flaky_acquire(task_name):
+        attempts.append(task_name)
+        if len(attempts) == 1:
+            raise OSError("spool unreachable")
+        return acquire(task_name)
+
+    monkeypatch.setattr(worker, "acquire", flaky_acquire)
+    worker.run()
+
+    manifest = read_json(output_dir / "manifest.json")
+    assert manifest["failed_shards"] == [f"{job_id}.000075.json"]
+    assert [frame["index"] for frame in manifest["frames"]] == list(range(75))
+    assert os.listdir(spool_dir / "leases") == []
+
+
+def test_stale_leases_are_measured_with_spool_clock(app, monkeypatch, tmp_path):
+    worker = app.SpoolWorker(str(tmp_path))
+    fresh_lease = worker.lease_path("fresh.json")
+    stale_lease = worker.lease_path("stale.json")
+    for path in (fresh_lease, stale_lease):
+        with open(path, "w") as f:
+            f.write("other-worker")
+    os.utime(stale_lease, (0, 0))
+
+    # This host's clock is far off from the file server's
+    monkeypatch.setattr(app, "time", lambda: 0)
+    assert not worker.acquire("fresh.json")
+    assert worker.acquire("stale.json")
+    assert worker.lease_owner("stale.json") == worker.worker_id
+    assert sorted(os.listdir(tmp_path / "leases")) == ["fresh.json.lease", "stale.json.lease"]